@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+# --- AUTH TOKENS ---
+# Login hands out a bearer token: the user's small header claims (id, name,
+# institute) signed with SECRET_KEY and timestamped. Checking one is an HMAC
+# and a clock comparison, no database. Requests send it as
+# "Authorization: Bearer <token>"; a missing, forged or expired token leaves
+# the request anonymous.
+#
+# Endpoints that need more than the claims, or data fresher than the token,
+# read the user's principal from a per-worker LRU instead of querying the user
+# on every request. Writes to a user invalidate their entry in this worker; the
+# TTL bounds how long another worker can serve the old one.
+
+
+class PrincipalCache:
+    def __init__(self, loader, max_entries=10000, ttl=300):
+        self.loader = loader # user_id -> principal dict, or None for an unknown user
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict() # user_id -> (expires_at, principal), least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._entries.move_to_end(user_id)
+                return entry[1]
+        principal = self.loader(user_id)
+        if principal is None: return None
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids: self._entries.pop(user_id, None)
+
+
+class TokenAuth:
+    def __init__(self, loader=None):
+        self.serializer = None
+        self.max_age = 86400
+        self.principals = PrincipalCache(loader)
+
+    def init_app(self, app):
+        # Signs with SECRET_KEY; AUTH_TOKEN_MAX_AGE and AUTH_PRINCIPAL_* from the app's config
+        self.serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='auth-token')
+        self.max_age = app.config['AUTH_TOKEN_MAX_AGE']
+        self.principals.max_entries = app.config['AUTH_PRINCIPAL_CACHE_SIZE']
+        self.principals.ttl = app.config['AUTH_PRINCIPAL_TTL']
+
+    def principal_loader(self, fn):
+        # Decorator registering fn(user_id) as the principal loader
+        self.principals.loader = fn
+        return fn
+
+    def issue(self, claims):
+        return self.serializer.dumps(claims)
+
+    def verify(self, token):
+        # The claims of a valid token, else None
+        try:
+            return self.serializer.loads(token, max_age=self.max_age)
+        except BadSignature: # SignatureExpired included
+            return None
+
+    def claims(self):
+        # Claims of the current request's bearer token, checked once per request
+        if 'auth_claims' not in g:
+            scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+            g.auth_claims = self.verify(token) if scheme.lower() == 'bearer' and token else None
+        return g.auth_claims
+
+    def user_id(self):
+        claims = self.claims()
+        return claims['id'] if claims else None
+
+    def principal(self):
+        # The authenticated user's cached principal, None when anonymous (or the user is gone)
+        user_id = self.user_id()
+        return None if user_id is None else self.principals.get(user_id)
@@ -0,0 +1,65 @@
+import bisect
+import threading
+import time
+
+# --- IN-MEMORY AUTOCOMPLETE ---
+# Small, rarely-changing vocabularies (skills, tools, institutes, branches) are
+# held per worker as a sorted array of lowercased names. Prefix hits come from
+# a binary search, substring hits from a scan of the (tiny) remainder, so the
+# lookup endpoints never touch the database on a keypress.
+#
+# The loader returns (name, payload) pairs and runs lazily on first use after
+# invalidate(). Writes in this worker invalidate directly; the TTL bounds how
+# long another worker can serve a stale list.
+
+
+class AutocompleteIndex:
+    def __init__(self, loader, ttl=300):
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state = None # (expires_at, payloads in load order, sorted keys, payloads in key order)
+
+    def invalidate(self):
+        self._state = None
+
+    def load(self):
+        pairs = list(self.loader())
+        ordered = sorted(pairs, key=lambda pair: pair[0].lower())
+        state = (time.monotonic() + self.ttl, [payload for _, payload in pairs],
+                 [name.lower() for name, _ in ordered], [payload for _, payload in ordered])
+        self._state = state
+        return state
+
+    def _current(self):
+        state = self._state
+        if state is None or state[0] < time.monotonic():
+            with self._lock:
+                state = self._state
+                if state is None or state[0] < time.monotonic():
+                    state = self.load()
+        return state
+
+    def all(self):
+        return self._current()[1]
+
+    def find(self, name):
+        # Exact, case-insensitive lookup; None when the name isn't in the vocabulary
+        _, _, keys, payloads = self._current()
+        i = bisect.bisect_left(keys, name.lower())
+        return payloads[i] if i < len(keys) and keys[i] == name.lower() else None
+
+    def search(self, term, limit=10):
+        _, _, keys, payloads = self._current()
+        term = term.lower()
+        start = bisect.bisect_left(keys, term)
+        end = bisect.bisect_right(keys, term + '\uffff', lo=start)
+        # limit=None returns every match
+        results = payloads[start:end if limit is None else min(end, start + limit)]
+        if limit is None or len(results) < limit:
+            # Names containing the term somewhere other than at the start
+            for i, key in enumerate(keys):
+                if (i < start or i >= end) and term in key:
+                    results.append(payloads[i])
+                    if len(results) == limit: break
+        return results
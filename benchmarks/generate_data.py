@@ -0,0 +1,152 @@
+"""Fill a database with synthetic users, skills, projects and tools at production scale.
+
+Applies the migrations and seed data, then bulk inserts users with a long
+tail of skill popularity (a few skills almost everyone lists, many rare ones),
+projects with a handful of members and tools each, and extra institutes and
+branches. Every generated user's password is "bench".
+
+    python benchmarks/generate_data.py --users 100000                     # ./bench.db
+    python benchmarks/generate_data.py --users 100000 --database-url mysql+mysqlconnector://...
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SKILLS = ['Python', 'JavaScript', 'HTML', 'CSS', 'Java', 'C', 'C++', 'SQL', 'React', 'Node.js', 'Git', 'Linux',
+          'Machine Learning', 'Data Analysis', 'Django', 'Flask', 'TypeScript', 'Go', 'Rust', 'Kotlin', 'Swift',
+          'Docker', 'Kubernetes', 'AWS', 'Figma', 'UI Design', 'MATLAB', 'AutoCAD', 'SolidWorks', 'Arduino',
+          'Embedded C', 'VHDL', 'PCB Design', 'Deep Learning', 'Computer Vision', 'NLP', 'Statistics', 'R',
+          'Excel', 'Public Speaking', 'Technical Writing', 'Flutter', 'Android', 'iOS', 'Unity', 'Blender',
+          'Cyber Security', 'Networking', 'Blockchain', 'Raspberry Pi']
+TOOLS = ['Git', 'Docker', 'VS Code', 'GitHub Actions', 'Jira', 'Figma', 'Postman', 'MySQL', 'PostgreSQL', 'MongoDB',
+         'Redis', 'Firebase', 'TensorFlow', 'PyTorch', 'Jupyter', 'Arduino IDE', 'KiCad', 'MATLAB', 'Simulink',
+         'Unity', 'Blender', 'AWS', 'Heroku', 'Vercel', 'Nginx']
+INSTITUTES = ['IIT Madras', 'IIT Delhi', 'NIT Trichy', 'BITS Pilani', 'VIT Vellore', 'Anna University',
+              'Model Engineering College', 'TKM College of Engineering', 'Rajagiri School of Engineering',
+              'Government Engineering College Thrissur']
+BRANCHES = ['Computer Science', 'Electronics', 'Mechanical', 'Electrical', 'Civil', 'Information Technology',
+            'Chemical', 'Biotechnology', 'Aerospace', 'Data Science']
+FIRST_NAMES = ['Aarav', 'Aditi', 'Akhil', 'Anjali', 'Arjun', 'Devika', 'Fathima', 'Gokul', 'Irfan', 'Kavya', 'Lakshmi',
+               'Meera', 'Nandana', 'Nikhil', 'Priya', 'Rahul', 'Riya', 'Sandeep', 'Sneha', 'Vishnu', 'Zara', 'Joel']
+LAST_NAMES = ['Nair', 'Menon', 'Pillai', 'Sharma', 'Iyer', 'Khan', 'Thomas', 'Varghese', 'Reddy', 'Das', 'Joseph',
+              'Kurian', 'Rao', 'Singh', 'Mathew', 'George']
+WORDS = ['smart', 'campus', 'energy', 'tracker', 'robot', 'vision', 'health', 'assistant', 'drone', 'network',
+         'portal', 'sensor', 'learning', 'market', 'chat', 'garden', 'traffic', 'library', 'water', 'solar']
+
+
+def zipf_weights(n, s=1.1):
+    # Popularity falls off with rank, like real skill and tool usage
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def weighted_sample(rng, population, weights, k):
+    chosen = dict.fromkeys(rng.choices(population, weights, k=k * 2))
+    return list(chosen)[:k]
+
+
+def bulk_insert(db, model, rows, batch):
+    for i in range(0, len(rows), batch):
+        db.session.execute(db.insert(model), rows[i:i + batch])
+    db.session.commit()
+
+
+def ensure_names(db, model, names):
+    # Ids of the vocabulary, inserting the names that aren't there yet
+    existing = dict(db.session.execute(db.select(model.name, model.id)).all())
+    missing = [{'name': name} for name in names if name not in existing]
+    if missing: bulk_insert(db, model, missing, len(missing))
+    return list(db.session.execute(db.select(model.id).order_by(model.id)).scalars())
+
+
+def generate(app, users, projects, seed=42, batch=5000, log=print):
+    import app as appmod
+    from werkzeug.security import generate_password_hash
+    db, rng = appmod.db, random.Random(seed)
+    with app.app_context():
+        skill_ids = ensure_names(db, appmod.Skill, SKILLS)
+        tool_ids = ensure_names(db, appmod.Tool, TOOLS)
+        institute_ids = ensure_names(db, appmod.Institute, INSTITUTES)
+        skill_weights, tool_weights = zipf_weights(len(skill_ids)), zipf_weights(len(tool_ids))
+        password_hash = generate_password_hash('bench', method=app.config['PASSWORD_HASH_METHOD'])
+        first_user = (db.session.execute(db.select(db.func.max(appmod.User.id))).scalar() or 0) + 1
+        first_project = (db.session.execute(db.select(db.func.max(appmod.Project.id))).scalar() or 0) + 1
+
+        started = time.perf_counter()
+        for lo in range(first_user, first_user + users, batch):
+            hi = min(lo + batch, first_user + users)
+            rows, skills = [], []
+            for i in range(lo, hi):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                rows.append({'id': i, 'username': f'user{i}', 'password_hash': password_hash,
+                             'full_name': f'{first} {last}', 'email': f'user{i}@example.com',
+                             'phone': f'+91{9000000000 + i}' if rng.random() < 0.7 else None,
+                             'year': rng.randint(1, 4), 'branch': rng.choice(BRANCHES),
+                             'bio': f'{rng.choice(BRANCHES)} student interested in {rng.choice(WORDS)} {rng.choice(WORDS)}.',
+                             'institute_id': rng.choice(institute_ids) if rng.random() < 0.9 else None})
+                count = min(len(skill_ids), max(0, int(rng.gauss(4, 2))))
+                skills.extend({'user_id': i, 'skill_id': skill_id, 'rating': min(5, max(1, round(rng.gauss(3, 1))))}
+                              for skill_id in weighted_sample(rng, skill_ids, skill_weights, count))
+            db.session.execute(db.insert(appmod.User), rows)
+            if skills: db.session.execute(db.insert(appmod.UserSkill), skills)
+            db.session.commit()
+            log(f'users {hi - first_user:>8}/{users}  {time.perf_counter() - started:6.1f}s')
+
+        last_user = first_user + users - 1
+        today = date.today()
+        for lo in range(first_project, first_project + projects, batch):
+            hi = min(lo + batch, first_project + projects)
+            rows, members, tools = [], [], []
+            for i in range(lo, hi):
+                rows.append({'id': i, 'name': f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}',
+                             'description': ' '.join(rng.choices(WORDS, k=12)).capitalize() + '.',
+                             'project_type': rng.choice(['Software', 'Hardware']),
+                             'status': rng.choice(['In Progress', 'Completed', 'Planning']),
+                             'start_date': today - timedelta(days=rng.randint(0, 3 * 365)) if rng.random() < 0.95 else None})
+                if last_user >= 1:
+                    count = min(last_user, rng.randint(1, 6))
+                    members.extend({'project_id': i, 'user_id': user_id} for user_id in rng.sample(range(1, last_user + 1), count))
+                tools.extend({'project_id': i, 'tool_id': tool_id}
+                             for tool_id in weighted_sample(rng, tool_ids, tool_weights, rng.randint(1, 5)))
+            db.session.execute(db.insert(appmod.Project), rows)
+            if members: db.session.execute(db.insert(appmod.ProjectMember), members)
+            db.session.execute(db.insert(appmod.ProjectTool), tools)
+            db.session.commit()
+            log(f'projects {hi - first_project:>5}/{projects}  {time.perf_counter() - started:6.1f}s')
+
+        # Bulk inserts bypass the endpoints that keep the search documents current
+        appmod.refresh_search_docs(range(first_user, first_user + users))
+        appmod.refresh_search_docs(db.session.execute(db.select(appmod.ProjectMember.user_id).distinct().where(
+            appmod.ProjectMember.project_id >= first_project, appmod.ProjectMember.user_id < first_user)).scalars().all())
+        db.session.commit()
+        log(f'search documents  {time.perf_counter() - started:6.1f}s')
+
+        # Statistics for the query planner after a bulk load
+        if db.engine.dialect.name == 'sqlite':
+            db.session.execute(db.text('ANALYZE'))
+            db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=f"sqlite:///{os.path.abspath('bench.db')}")
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--projects', type=int, help='default: one per ten users')
+    parser.add_argument('--batch', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ.setdefault('SECRET_KEY', 'benchmark-only') # create_app() requires one; tokens here are throwaway
+    import app as appmod
+    app = appmod.create_app()
+    appmod.setup_database(app)
+    generate(app, args.users, args.users // 10 if args.projects is None else args.projects, args.seed, args.batch)
+
+
+if __name__ == '__main__':
+    main()
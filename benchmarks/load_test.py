@@ -0,0 +1,214 @@
+"""Latency, throughput and query counts of every /api/* endpoint under concurrent load.
+
+Requests are sent from a thread pool through the app in-process, so the numbers
+cover the app and the database without network noise. Each request's SQL
+statements are counted as well. Pass --url to load a running server instead,
+e.g. gunicorn; query counts aren't available in that mode.
+
+Results can be saved as a baseline and compared against it later. The run
+fails when an endpoint's p95 latency or its query count regresses.
+
+    python benchmarks/load_test.py --users 20000 --save-baseline benchmarks/baselines/sqlite-20k.json
+    python benchmarks/load_test.py --users 20000 --baseline benchmarks/baselines/sqlite-20k.json
+    python benchmarks/load_test.py --database-url sqlite:///bench.db --concurrency 1 8 32 --requests 500
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def scenarios(sample):
+    # name -> (method, function returning (url, json body)); sample holds ids and names from the database
+    rng, counter = sample['rng'], iter(range(10 ** 9))
+    user, project = lambda: rng.choice(sample['user_ids']), lambda: rng.choice(sample['project_ids'])
+    skill, tool = lambda: rng.choice(sample['skills']), lambda: rng.choice(sample['tools'])
+    word = lambda: rng.choice(sample['words'])
+    return {
+        'students/search': ('GET', lambda: ('/api/students/search', None)),
+        'students/search?q': ('GET', lambda: (f'/api/students/search?q={quote(word())}', None)),
+        'students/search?skills': ('GET', lambda: (f"/api/students/search?skills={quote(','.join(f'{s}:{rng.randint(1, 3)}' for s in {skill(), skill()}))}", None)),
+        'students/search?branch': ('GET', lambda: (f"/api/students/search?branch={quote(rng.choice(sample['branches']))}&year={rng.randint(1, 4)}", None)),
+        'students/search?facets': ('GET', lambda: (f"/api/students/search?facets=1&branch={quote(rng.choice(sample['branches']))}&skills={quote(skill())}:2", None)),
+        'students/recommend': ('GET', lambda: (f"/api/students/recommend?skills={quote(','.join(f'{s}:{rng.randint(2, 5)}' for s in {skill(), skill(), skill()}))}", None)),
+        'students/recommend?pid': ('GET', lambda: (f'/api/students/recommend?project_id={project()}&mode=coverage', None)),
+        'profile GET': ('GET', lambda: (f'/api/profile/{user()}', None)),
+        'profile network': ('GET', lambda: (f'/api/profile/{user()}/network', None)),
+        'profile POST': ('POST', lambda: (f'/api/profile/{user()}', {
+            'full_name': 'Load Test', 'email': f'load{next(counter)}-{rng.random()}@example.com', 'year': 2,
+            'branch': rng.choice(sample['branches']), 'skills': [{'name': skill(), 'rating': rng.randint(1, 5)}]})),
+        'institutes': ('GET', lambda: ('/api/institutes', None)),
+        'skills/search': ('GET', lambda: (f'/api/skills/search?q={quote(skill()[:2])}', None)),
+        'branches': ('GET', lambda: ('/api/branches', None)),
+        'projects': ('GET', lambda: ('/api/projects', None)),
+        'projects?q': ('GET', lambda: (f'/api/projects?q={quote(word())}', None)),
+        'project GET': ('GET', lambda: (f'/api/project/{project()}', None)),
+        'tools/search': ('GET', lambda: (f'/api/tools/search?q={quote(tool()[:2])}', None)),
+        'users/search': ('GET', lambda: (f"/api/users/search?q={quote(rng.choice(sample['names'])[:3])}", None)),
+        'projects/search': ('GET', lambda: (f'/api/projects/search?q={quote(word())}', None)),
+        'projects/create': ('POST', lambda: ('/api/projects/create', {
+            'name': f'Load {next(counter)}', 'description': 'Load test project', 'creator_id': user(),
+            'members': [user(), user()], 'tools': [tool(), tool()], 'start_date': '2024-06-01'})),
+        'register': ('POST', lambda: ('/api/register', {
+            'username': f'load{next(counter)}-{rng.random()}', 'password': 'bench', 'email': f'reg{rng.random()}@example.com'})),
+        'login': ('POST', lambda: ('/api/login', {'username': rng.choice(sample['usernames']), 'password': 'bench'})),
+    }
+
+
+def load_sample(appmod, app, seed):
+    db = appmod.db
+    with app.app_context():
+        ids = lambda model: list(db.session.execute(db.select(model.id).order_by(db.func.random()).limit(1000)).scalars())
+        user_ids = ids(appmod.User)
+        users = db.session.execute(db.select(appmod.User.username, appmod.User.full_name).where(appmod.User.id.in_(user_ids))).all()
+        return {
+            'rng': random.Random(seed),
+            'user_ids': user_ids,
+            'project_ids': ids(appmod.Project) or [1],
+            'usernames': [u.username for u in users if u.username.startswith('user')] or ['lakshmi'],
+            'names': [u.full_name for u in users if u.full_name] or ['Lakshmi'],
+            'skills': list(db.session.execute(db.select(appmod.Skill.name)).scalars()),
+            'tools': list(db.session.execute(db.select(appmod.Tool.name)).scalars()) or ['Git'],
+            'branches': list(db.session.execute(db.select(appmod.User.branch).where(appmod.User.branch != None).distinct()).scalars()),
+            'words': ['smart', 'robot', 'vision', 'energy', 'student', 'sensor', 'network', 'nair', 'priya'],
+        }
+
+
+class InProcessClient:
+    def __init__(self, app, engine):
+        from sqlalchemy import event
+        self.app, self._local = app, threading.local()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self._local.queries = getattr(self._local, 'queries', 0) + 1
+
+    def request(self, method, url, body):
+        client = getattr(self._local, 'client', None) or self.app.test_client()
+        self._local.client, self._local.queries = client, 0
+        response = client.open(url, method=method, json=body)
+        response.get_data() # drain streamed bodies, their queries run while streaming
+        response.close()
+        return response.status_code, self._local.queries
+
+
+class HTTPClient:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, url, body):
+        data = json.dumps(body).encode() if body is not None else None
+        req = Request(self.base_url + url, data=data, method=method, headers={'Content-Type': 'application/json'})
+        try:
+            with urlopen(req) as response:
+                response.read()
+                return response.status, None
+        except HTTPError as e:
+            return e.code, None
+
+
+def run(client, method, make_request, concurrency, requests, warmup):
+    def one(_):
+        url, body = make_request()
+        started = time.perf_counter()
+        status, queries = client.request(method, url, body)
+        return (time.perf_counter() - started) * 1000, status, queries
+
+    for i in range(warmup): one(i) # first-use costs (compiled statements, lazy indexes) aren't steady state
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies = [r[0] for r in results]
+    pct = statistics.quantiles(latencies, n=100, method='inclusive')
+    queries = [r[2] for r in results if r[2] is not None]
+    return {
+        'rps': round(requests / elapsed, 1),
+        'p50': round(pct[49], 2), 'p95': round(pct[94], 2), 'p99': round(pct[98], 2),
+        'queries': round(statistics.mean(queries), 2) if queries else None,
+        'errors': sum(1 for r in results if r[1] >= 400),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    found = []
+    for key, result in results.items():
+        base = baseline.get('results', {}).get(key)
+        if not base: continue
+        if result['p95'] > base['p95'] * (1 + tolerance) and result['p95'] - base['p95'] > 1:
+            found.append(f"{key}: p95 {base['p95']:.2f} -> {result['p95']:.2f} ms")
+        if result['queries'] is not None and base.get('queries') is not None and result['queries'] > base['queries'] + 0.5:
+            found.append(f"{key}: queries/request {base['queries']} -> {result['queries']}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', help='existing database (see generate_data.py); default: generate a throwaway SQLite one')
+    parser.add_argument('--users', type=int, default=20000, help='users to generate for the throwaway database')
+    parser.add_argument('--url', help='base URL of a running server to load instead of the in-process app')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint and concurrency level')
+    parser.add_argument('--warmup', type=int, default=10, help='untimed requests per endpoint before measuring')
+    parser.add_argument('--endpoints', nargs='+', help='subset of endpoint names to run')
+    parser.add_argument('--baseline', help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', help='write the results to this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed p95 increase over the baseline (0.5 = 50%%)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generated = not args.database_url
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='load-test-'), 'bench.db')}"
+    os.environ.setdefault('SECRET_KEY', 'benchmark-only') # create_app() requires one; tokens here are throwaway
+    import app as appmod
+    app = appmod.create_app()
+    if generated:
+        from generate_data import generate
+        appmod.setup_database(app)
+        generate(app, args.users, args.users // 10, args.seed, log=lambda line: None)
+    else:
+        appmod.upgrade_database(app)
+    with app.app_context():
+        engine = appmod.db.engine
+    client = HTTPClient(args.url) if args.url else InProcessClient(app, engine)
+
+    all_scenarios = scenarios(load_sample(appmod, app, args.seed))
+    names = args.endpoints or list(all_scenarios)
+    results = {}
+    print(f"{'endpoint':<24} {'conc':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7} {'errors':>6}")
+    for concurrency in args.concurrency:
+        for name in names:
+            method, make_request = all_scenarios[name]
+            result = results[f'{name}@{concurrency}'] = run(client, method, make_request, concurrency, args.requests, args.warmup)
+            queries = '-' if result['queries'] is None else f"{result['queries']:.1f}"
+            print(f"{name:<24} {concurrency:>4} {result['rps']:>8.1f} {result['p50']:>8.2f} {result['p95']:>8.2f} "
+                  f"{result['p99']:>8.2f} {queries:>7} {result['errors']:>6}")
+
+    if args.save_baseline:
+        meta = {'database': engine.dialect.name, 'users': args.users if generated else None,
+                'requests': args.requests, 'target': args.url or 'in-process'}
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+            f.write('\n')
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        found = regressions(results, baseline, args.tolerance)
+        for line in found: print(f'REGRESSION  {line}')
+        for key in results.keys() - baseline['results'].keys(): print(f'NO BASELINE  {key} (not compared; re-save the baseline)')
+        sys.exit(1 if found else 0)
+
+
+if __name__ == '__main__':
+    main()
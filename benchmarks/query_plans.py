@@ -0,0 +1,108 @@
+"""Fail when an endpoint query falls back to a full table scan or an endpoint runs extra queries.
+
+Runs every read endpoint against a small seeded database, captures the
+SELECTs each one issues and checks their EXPLAIN plans. Exits non-zero and
+lists the offending statements if any plan scans a whole table, or if an
+endpoint issues more statements than its budget (an N+1 in a serializer
+shows up as one more query per row).
+
+    python benchmarks/query_plans.py                      # throwaway SQLite
+    python benchmarks/query_plans.py --database-url mysql+mysqlconnector://...
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# url -> most statements it may issue. Pages hold several rows with several
+# related rows each, so a relationship loaded per row goes over budget.
+ENDPOINTS = {
+    '/api/students/search': 2,
+    '/api/students/search?q=pyth': 1,
+    '/api/students/search?skills=Python:3,HTML:2': 1,
+    '/api/students/search?branch=Electronics&year=2&institute=IIT%20Bombay': 1,
+    '/api/students/search?expand=projects.members': 5,
+    '/api/profile/1': 4,
+    '/api/profile/1?expand=projects.tools,projects.members.skills': 8, # + the newest versions, always read for nested shapes
+    '/api/projects': 4,
+    '/api/projects?q=demo': 3,
+    '/api/projects?fields=name,members.skills,members.projects.name': 4,
+    '/api/project/1': 4,
+    '/api/users/search?q=moh': 1,
+    '/api/projects/search?q=demo': 1,
+}
+
+# Scans that walk the primary key in order and stop at the page LIMIT
+BOUNDED_SCANS = {('/api/students/search', 'user'), ('/api/students/search', 'student_search_doc'),
+                 ('/api/students/search?expand=projects.members', 'user')}
+
+SQLITE_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+def full_scans(connection, statement, params):
+    if connection.dialect.name == 'sqlite':
+        plan = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, params).all()
+        return [m.group(1) for m in (SQLITE_SCAN.match(row[-1]) for row in plan) if m]
+    plan = connection.exec_driver_sql('EXPLAIN ' + statement, params).mappings().all()
+    return [row['table'] for row in plan if row['type'] == 'ALL']
+
+
+def seed_sample_data(client):
+    client.post('/api/profile/2', json={'full_name': 'Miza Harris', 'email': 'miza@example.com', 'branch': 'Electronics',
+                                        'skills': [{'name': 'Python', 'rating': 4}, {'name': 'HTML', 'rating': 2}]})
+    for i in range(3):
+        client.post('/api/projects/create', json={'name': f'Demo {i}', 'description': 'Sample project', 'creator_id': 1,
+                                                  'members': [2, 3], 'tools': ['Git', 'Docker'], 'start_date': f'2024-0{i + 1}-01'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'plans.db')}"
+    os.environ.setdefault('SECRET_KEY', 'benchmark-only') # create_app() requires one; tokens here are throwaway
+    import app as appmod
+    app = appmod.create_app()
+    from sqlalchemy import event
+
+    appmod.setup_database(app)
+    client = app.test_client()
+    seed_sample_data(client)
+    appmod.jobs.flush() # search documents are refreshed in the background
+
+    with app.app_context():
+        engine = appmod.db.engine
+    captured, failures, over_budget = [], [], []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def capture(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'): captured.append((statement, params))
+
+    for url, budget in ENDPOINTS.items():
+        captured.clear()
+        response = client.get(url)
+        response.get_data() # streamed pages run their queries while the body is read
+        assert response.status_code == 200, url
+        statements = list(captured)
+        url_failures = []
+        with engine.connect() as connection:
+            for statement, params in statements:
+                scans = [t for t in full_scans(connection, statement, params) if (url, t) not in BOUNDED_SCANS]
+                if scans: url_failures.append((url, scans, statement))
+        failures.extend(url_failures)
+        if len(statements) > budget: over_budget.append((url, budget, statements))
+        status = 'FULL SCAN' if url_failures else 'TOO MANY' if len(statements) > budget else 'ok'
+        print(f"{status:>9}  {len(statements)} queries  {url}")
+
+    for url, scans, statement in failures:
+        print(f"\n{url}: full scan of {', '.join(scans)}\n{statement}")
+    for url, budget, statements in over_budget:
+        print(f"\n{url}: {len(statements)} queries, budget {budget}\n" + '\n'.join(statement for statement, _ in statements))
+    sys.exit(1 if failures or over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Latency of the student skill filter versus required skills and user count.
+
+Builds a throwaway SQLite database, grows it to each requested user count and
+times /api/students/search?skills=... for 1..max_skills required skills.
+
+    python benchmarks/skill_filter.py --users 1000 10000 100000 --max-skills 5
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def grow_users(db, User, UserSkill, skill_ids, start, stop, password_hash, rng):
+    users = [{'id': i, 'username': f'bench{i}', 'password_hash': password_hash,
+              'full_name': f'Bench User {i}', 'email': f'bench{i}@example.com',
+              'year': rng.randint(1, 4)} for i in range(start, stop)]
+    user_skills = [{'user_id': i, 'skill_id': skill_id, 'rating': rng.randint(1, 5)}
+                   for i in range(start, stop)
+                   for skill_id in rng.sample(skill_ids, rng.randint(1, 6))]
+    db.session.execute(db.insert(User), users)
+    db.session.execute(db.insert(UserSkill), user_skills)
+    db.session.commit()
+
+
+def time_request(client, url, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        samples.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.data
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--max-skills', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='skill-filter-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault('SECRET_KEY', 'benchmark-only') # create_app() requires one; tokens here are throwaway
+    import app as appmod
+    app = appmod.create_app()
+    from werkzeug.security import generate_password_hash
+
+    rng = random.Random(args.seed)
+    appmod.setup_database(app)
+    client = app.test_client()
+    with app.app_context():
+        skills = appmod.Skill.query.order_by(appmod.Skill.id).all()
+        skill_ids = [s.id for s in skills]
+        start = appmod.db.session.query(appmod.func.max(appmod.User.id)).scalar() + 1
+        password_hash = generate_password_hash('bench', method='pbkdf2:sha256')
+
+        print(f"{'users':>8} " + ' '.join(f'{k:>3} skill(s) ms' for k in range(1, args.max_skills + 1)))
+        for target in sorted(args.users):
+            stop = target + 1 # ids 1..target, the seeded users included
+            if stop > start:
+                grow_users(appmod.db, appmod.User, appmod.UserSkill, skill_ids, start, stop, password_hash, rng)
+                appmod.refresh_search_docs(range(start, stop))
+                appmod.db.session.commit()
+                start = stop
+            timings = []
+            for k in range(1, args.max_skills + 1):
+                wanted = ','.join(f'{s.name}:{rng.randint(1, 3)}' for s in rng.sample(skills, k))
+                timings.append(time_request(client, f'/api/students/search?skills={quote(wanted)}', args.repeat))
+            print(f'{target:>8} ' + ' '.join(f'{t:>15.2f}' for t in timings))
+
+
+if __name__ == '__main__':
+    main()
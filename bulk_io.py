@@ -0,0 +1,101 @@
+import csv
+import json
+import os
+import sys
+from itertools import islice
+
+# --- BULK FILES ---
+# Record streams for `flask import` / `flask export` (see BULK IMPORT / EXPORT
+# in app.py). A file is CSV with a header row or JSON Lines, told apart by its
+# extension, and is read and written one record at a time so its size never
+# matters. List fields (skills, members, tools) are JSON arrays in JSONL and
+# ';'-separated in CSV, e.g. "Python:4;React:3".
+#
+# A checkpoint file remembers how many records of an input have been committed;
+# an interrupted import started again skips them and carries on. A JSONL line
+# that doesn't parse is yielded as a RecordError in its place, so the caller can
+# reject that one record without losing count of the rest.
+
+LIST_SEPARATOR = ';'
+
+
+class RecordError(ValueError):
+    pass
+
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv': return 'csv'
+    if ext in ('.jsonl', '.ndjson'): return 'jsonl'
+    raise ValueError(f'{path}: expected a .csv or .jsonl file')
+
+
+def read_records(path, skip=0):
+    # Yields the file's records as dicts, after skipping the first `skip`
+    with open(path, newline='', encoding='utf-8') as f:
+        if file_format(path) == 'csv':
+            records = ({k: v if v != '' else None for k, v in row.items()} for row in csv.DictReader(f))
+        else:
+            records = (_parse_line(line) for line in f if line.strip())
+        yield from islice(records, skip, None)
+
+
+def _parse_line(line):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return RecordError(f'unreadable line: {e}')
+
+
+def batches(records, size):
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+def as_list(value):
+    # A list field from either format; None and '' are empty
+    if value is None: return []
+    if isinstance(value, list): return value
+    return [item.strip() for item in str(value).split(LIST_SEPARATOR) if item.strip()]
+
+
+class RecordWriter:
+    # Writes dicts to path ('-' for stdout) in the format its extension names
+    def __init__(self, path, fields, format=None):
+        self.path, self.fields = path, fields
+        self.format = format or ('jsonl' if path == '-' else file_format(path))
+
+    def __enter__(self):
+        self._file = sys.stdout if self.path == '-' else open(self.path, 'w', newline='', encoding='utf-8')
+        if self.format == 'csv':
+            self._csv = csv.DictWriter(self._file, self.fields)
+            self._csv.writeheader()
+        return self
+
+    def write(self, record):
+        if self.format == 'csv':
+            self._csv.writerow({k: LIST_SEPARATOR.join(map(str, v)) if isinstance(v, list) else v for k, v in record.items()})
+        else:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+    def __exit__(self, *exc):
+        if self._file is not sys.stdout: self._file.close()
+
+
+class Checkpoint:
+    def __init__(self, path):
+        self.path = path
+        self.done = 0
+        if path and os.path.exists(path):
+            with open(path) as f: self.done = json.load(f)['done']
+
+    def advance(self, count):
+        # Records committed so far; written atomically, so a crash leaves the previous value
+        self.done += count
+        if not self.path: return
+        with open(self.path + '.tmp', 'w') as f: json.dump({'done': self.done}, f)
+        os.replace(self.path + '.tmp', self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path): os.remove(self.path)
@@ -0,0 +1,131 @@
+import threading
+import time
+import numpy as np
+
+# --- COLLABORATION GRAPH ---
+# The user-project membership table as compressed sparse rows, held per worker:
+# for every project id its members and tools, for every user id their projects,
+# each one flat array of neighbour ids plus an offsets array indexed by id.
+# A user's projects are one slice, and expanding a whole set of users or
+# projects is a few vectorized gathers, so 1st- and 2nd-degree collaborators
+# need no SQL (ProjectMember joined to itself two and four times).
+#
+# The loader returns ([(project_id, user_id)], [(project_id, tool_id)]); called
+# with a list of project ids it returns just those projects' edges. update()
+# swaps in a state with those projects' edges replaced, so a reader never sees
+# a half-applied change, and the TTL bounds how stale another worker's copy gets.
+
+
+def _edges(pairs):
+    return np.array([tuple(pair) for pair in pairs], dtype=np.int64).reshape(-1, 2)
+
+
+def _csr(rows, cols, size):
+    # (offsets, neighbours): row r's neighbours are neighbours[offsets[r]:offsets[r + 1]], ascending
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=offsets[1:])
+    return offsets, cols[np.lexsort((cols, rows))]
+
+
+def _gather(csr, rows):
+    # (i, neighbour) for every neighbour of every rows[i]; ids past the end have none
+    offsets, neighbours = csr
+    last = len(offsets) - 1
+    starts, ends = offsets[np.minimum(rows, last)], offsets[np.minimum(rows + 1, last)]
+    lengths = ends - starts
+    owners = np.repeat(np.arange(len(rows)), lengths)
+    positions = np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return owners, neighbours[positions]
+
+
+def _top(ids, scores, limit):
+    # Positions of the `limit` best scores, ties by ascending id
+    return np.lexsort((ids, -scores))[:limit]
+
+
+class _State:
+    def __init__(self, members, tools, ttl):
+        # members, tools: (project_id, user_id) and (project_id, tool_id) rows
+        self.members, self.tools = members, tools
+        projects = int(max(members[:, 0].max(initial=-1), tools[:, 0].max(initial=-1))) + 1
+        self.users = int(members[:, 1].max(initial=-1)) + 1
+        self.project_members = _csr(members[:, 0], members[:, 1], projects)
+        self.user_projects = _csr(members[:, 1], members[:, 0], self.users)
+        self.project_tools = _csr(tools[:, 0], tools[:, 1], projects)
+        self.expires_at = time.monotonic() + ttl
+
+    def replaced(self, project_ids, members, tools, ttl):
+        ids = np.array(project_ids, dtype=np.int64)
+        state = _State(np.concatenate([self.members[~np.isin(self.members[:, 0], ids)], members]),
+                       np.concatenate([self.tools[~np.isin(self.tools[:, 0], ids)], tools]), ttl)
+        state.expires_at = self.expires_at
+        return state
+
+    def projects_of(self, *user_ids):
+        return _gather(self.user_projects, np.array(user_ids, dtype=np.int64))[1]
+
+
+class CollaborationGraph:
+    def __init__(self, loader, ttl=600):
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state = None
+
+    def invalidate(self):
+        self._state = None
+
+    def load(self):
+        members, tools = self.loader()
+        state = _State(_edges(members), _edges(tools), self.ttl)
+        self._state = state
+        return state
+
+    def _current(self):
+        state = self._state
+        if state is None or state.expires_at < time.monotonic():
+            with self._lock:
+                state = self._state
+                if state is None or state.expires_at < time.monotonic():
+                    state = self.load()
+        return state
+
+    def update(self, project_ids):
+        # Re-reads the members and tools of project_ids (new, changed or deleted projects)
+        state = self._state
+        if state is None: return
+        project_ids = list(project_ids)
+        members, tools = self.loader(project_ids)
+        with self._lock:
+            if self._state is not state: return
+            self._state = state.replaced(project_ids, _edges(members), _edges(tools), self.ttl)
+
+    def network(self, user_id, limit=10):
+        # (first, second) degree collaborators of user_id, best first:
+        #   first:  [(user_id, shared project ids, shared tool ids)], most shared projects first
+        #   second: [(user_id, mutual collaborators, shared tool ids)], collaborators of collaborators
+        #           never on a project with user_id, most collaborators in common first
+        # Shared tools are those used on both the collaborator's projects and user_id's.
+        state = self._current()
+        mine = state.projects_of(user_id)
+        if not len(mine): return [], []
+        first, shared = np.unique(_gather(state.project_members, mine)[1], return_counts=True)
+        first, shared = first[first != user_id], shared[first != user_id]
+
+        # Every (collaborator's project, collaborator) not shared with user_id, then those projects' members
+        owners, projects = _gather(state.user_projects, first)
+        outside = ~np.isin(projects, mine)
+        owners, projects = owners[outside], projects[outside]
+        hops, reached = _gather(state.project_members, projects)
+        via = first[owners[hops]]
+        new = ~np.isin(reached, first) & (reached != user_id)
+        # Distinct (reached, via) pairs, so a collaborator counts once however many projects lead on
+        paths = np.unique(reached[new] * state.users + via[new])
+        second, mutual = np.unique(paths // state.users, return_counts=True)
+
+        my_tools = np.unique(_gather(state.project_tools, mine)[1])
+        def shared_tools(other):
+            return np.intersect1d(_gather(state.project_tools, state.projects_of(other))[1], my_tools).tolist()
+        return ([(int(first[i]), np.intersect1d(state.projects_of(first[i]), mine).tolist(), shared_tools(first[i]))
+                 for i in _top(first, shared, limit)],
+                [(int(second[i]), int(mutual[i]), shared_tools(second[i])) for i in _top(second, mutual, limit)])
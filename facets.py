@@ -0,0 +1,142 @@
+import threading
+import time
+
+# --- FACET INDEX ---
+# Sidebar counts for the student search from in-memory bitmaps: every student
+# gets a position, and every facet value (an institute, a branch, a year, a
+# skill at a minimum rating) keeps one Python int with the bits of its students
+# set. A filter is the OR of its values' bitmaps, the filtered set the AND of
+# the filters, and a count is one AND plus int.bit_count(). 100k students make
+# 12.5 KB per bitmap, so counting every value costs microseconds and no SQL.
+#
+# The loader yields (user_id, {facet: value}, [(skill_id, rating), ...]);
+# called with a list of ids it yields just those users. Like SkillMatrix, writes
+# call update() for the users they changed and a TTL bounds staleness between
+# workers.
+
+FACETS = ('institute', 'branch', 'year')
+MAX_RATING = 5
+
+
+class _State:
+    def __init__(self, rows, ttl):
+        # rows: [(user_id, {facet: value}, {skill_id: rating})], bit i is rows[i]
+        self.positions = {user_id: bit for bit, (user_id, _, _) in enumerate(rows)}
+        self.rows = {bit: (values, skills) for bit, (_, values, skills) in enumerate(rows)}
+        self.everyone = (1 << len(rows)) - 1
+        bits = {facet: {} for facet in FACETS}
+        skill_bits = {}
+        for bit, (_, values, skills) in enumerate(rows):
+            for facet, value in values.items():
+                if value is not None: bits[facet].setdefault(value, []).append(bit)
+            for skill_id, rating in skills.items():
+                levels = skill_bits.setdefault(skill_id, [[] for _ in range(MAX_RATING)])
+                for level in range(min(rating, MAX_RATING)): levels[level].append(bit)
+        # Built from bit lists in one go: OR-ing rows into big ints one at a time is quadratic
+        self.values = {facet: {value: _bitmap(found) for value, found in values.items()} for facet, values in bits.items()}
+        self.skills = {skill_id: [_bitmap(found) for found in levels] for skill_id, levels in skill_bits.items()}
+        self.expires_at = time.monotonic() + ttl
+
+    def set_row(self, user_id, values, skills):
+        bit = self.positions.get(user_id)
+        if bit is None:
+            bit = self.positions[user_id] = len(self.positions)
+        else:
+            self._clear(bit)
+        mask = 1 << bit
+        self.everyone |= mask
+        for facet, value in values.items():
+            if value is not None: self.values[facet][value] = self.values[facet].get(value, 0) | mask
+        for skill_id, rating in skills.items():
+            levels = self.skills.setdefault(skill_id, [0] * MAX_RATING)
+            for level in range(min(rating, MAX_RATING)): levels[level] |= mask
+        self.rows[bit] = (values, skills)
+
+    def _clear(self, bit):
+        values, skills = self.rows.pop(bit)
+        mask = ~(1 << bit)
+        for facet, value in values.items():
+            if value is not None: self.values[facet][value] &= mask
+        for skill_id in skills:
+            self.skills[skill_id] = [bitmap & mask for bitmap in self.skills[skill_id]]
+
+    def bitmap_of(self, user_ids):
+        return _bitmap(bit for bit in map(self.positions.get, user_ids) if bit is not None)
+
+
+class FacetIndex:
+    def __init__(self, loader, ttl=300):
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state = None
+
+    def invalidate(self):
+        self._state = None
+
+    def load(self):
+        state = _State([(user_id, values, dict(skills)) for user_id, values, skills in self.loader()], self.ttl)
+        self._state = state
+        return state
+
+    def _current(self):
+        state = self._state
+        if state is None or state.expires_at < time.monotonic():
+            with self._lock:
+                state = self._state
+                if state is None or state.expires_at < time.monotonic():
+                    state = self.load()
+        return state
+
+    def update(self, user_ids):
+        state = self._state
+        if state is None: return
+        rows = list(self.loader(list(user_ids)))
+        with self._lock:
+            if self._state is not state: return
+            for user_id, values, skills in rows: state.set_row(user_id, values, dict(skills))
+
+    def counts(self, filters, skills, within=None, exclude=()):
+        # ({facet: [(value, count)]}, total) for the students matching every filter.
+        # filters: {facet: [values]} (a student matches one of them); skills: {skill_id: min rating};
+        # within: user ids the set is limited to (e.g. the text match), None for everyone.
+        # A facet's own filter is left out of its counts, so the sidebar shows what
+        # checking another value of it would add; skill counts are within the full set.
+        state = self._current()
+        base = state.everyone if within is None else state.bitmap_of(within)
+        base &= ~state.bitmap_of(exclude)
+        for skill_id, rating in skills.items():
+            levels = state.skills.get(skill_id)
+            base &= levels[min(max(rating, 1), MAX_RATING) - 1] if levels else 0
+        chosen = {}
+        for facet, values in filters.items():
+            if values: chosen[facet] = _union(state.values[facet].get(value, 0) for value in values)
+
+        counts = {}
+        for facet in FACETS:
+            others = base
+            for other, bitmap in chosen.items():
+                if other != facet: others &= bitmap
+            counts[facet] = _ranked((value, (bitmap & others).bit_count()) for value, bitmap in state.values[facet].items())
+        matched = base
+        for bitmap in chosen.values(): matched &= bitmap
+        counts['skill'] = _ranked((skill_id, (levels[0] & matched).bit_count()) for skill_id, levels in state.skills.items())
+        return counts, matched.bit_count()
+
+
+def _bitmap(bits):
+    bits = list(bits)
+    if not bits: return 0
+    buffer = bytearray(max(bits) // 8 + 1)
+    for bit in bits: buffer[bit >> 3] |= 1 << (bit & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _union(bitmaps):
+    result = 0
+    for bitmap in bitmaps: result |= bitmap
+    return result
+
+
+def _ranked(counts):
+    return sorted(((value, count) for value, count in counts if count), key=lambda item: -item[1])
@@ -0,0 +1,32 @@
+import multiprocessing
+import os
+
+# --- GUNICORN (production server) ---
+# gunicorn -c gunicorn.conf.py wsgi:app
+# Pre-forked worker processes, each serving requests on a few threads. Keep
+# threads <= DB_POOL_SIZE (config.py) so a worker never waits on its own pool.
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+preload_app = True # build the app once in the master, workers start as forks of it
+timeout = 30
+keepalive = 5
+max_requests = 5000 # recycle workers now and then to cap slow memory growth
+max_requests_jitter = 500
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    # Connections opened by the master (migrations) must not be shared with the
+    # children: drop them from the inherited pool without closing the sockets
+    from app import db, jobs
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
+    jobs.start() # this worker's job threads, resuming what the outbox kept
+
+
+def worker_exit(server, worker):
+    # Finish the write-behind jobs this worker still holds (see jobs.py)
+    from app import jobs
+    jobs.flush()
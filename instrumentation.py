@@ -0,0 +1,174 @@
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# --- REQUEST INSTRUMENTATION ---
+# Opt-in (INSTRUMENTATION = True) per-request cost accounting. For every
+# request it records the number of SQL statements and their total time, time
+# spent serializing, total time and response size. It reports them in a
+# Server-Timing header and aggregates them per endpoint into histograms served
+# at /metrics in Prometheus text format. Statements slower than SLOW_QUERY_MS
+# are logged with their EXPLAIN plan after the response has been sent.
+#
+# Streamed responses send their headers before the rows are read, so their
+# Server-Timing covers the work done up to then; the histograms include the
+# whole stream. Metrics are kept per process: with several workers, each one
+# exposes its own counts.
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+EXPLAINED = ('SELECT', 'UPDATE', 'DELETE')
+
+
+class Histogram:
+    def __init__(self, name, help, buckets):
+        self.name, self.help, self.buckets = name, help, buckets
+        self.series = {} # labels -> [count per bucket..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None: series = self.series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self.series.items()):
+            label = ','.join(f'{k}="{v}"' for k, v in labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label}}} {series[-1]:.6f}')
+            lines.append(f'{self.name}_count{{{label}}} {cumulative}')
+        return lines
+
+
+def explain(connection, statement, params):
+    # The database's plan for a statement, one line per step
+    if connection.dialect.name == 'sqlite':
+        return [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, params)]
+    return [' '.join(f'{k}={v}' for k, v in row.items() if v is not None)
+            for row in connection.exec_driver_sql('EXPLAIN ' + statement, params).mappings()]
+
+
+class Instrumentation:
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_ms = 200
+        self.logger = None
+        self._lock = threading.Lock()
+        self.histograms = {
+            'duration': Histogram('http_request_duration_seconds', 'Time to serve the request, streaming included.', DURATION_BUCKETS),
+            'db': Histogram('http_request_db_seconds', 'Time spent executing SQL statements.', DURATION_BUCKETS),
+            'queries': Histogram('http_request_db_queries', 'SQL statements executed.', QUERY_BUCKETS),
+            'serialize': Histogram('http_request_serialize_seconds', 'Time spent turning results into JSON.', DURATION_BUCKETS),
+            'size': Histogram('http_response_size_bytes', 'Response body size.', SIZE_BUCKETS),
+        }
+
+    def init_app(self, app):
+        self.enabled = app.config['INSTRUMENTATION']
+        if not self.enabled: return
+        self.slow_query_ms, self.logger = app.config['SLOW_QUERY_MS'], app.logger
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        app.before_request(self._start)
+        app.after_request(self._finish_headers)
+        app.add_url_rule('/metrics', 'metrics', self.metrics)
+        # jsonify() bodies count as serialization; streamed and cached bodies use span() directly
+        respond = app.json.response
+        def timed_response(*args, **kwargs):
+            with self.span('serialize'): return respond(*args, **kwargs)
+        app.json.response = timed_response
+
+    # The per-request record lives in the WSGI environ, which is shared by the
+    # view and the streaming context of the same request.
+    @staticmethod
+    def current():
+        return request.environ.get('instrumentation') if has_request_context() else None
+
+    def span(self, name):
+        # Adds the time spent inside the block, minus any SQL it ran, to the request's `name` total
+        if not self.enabled: return nullcontext()
+        return _Span(self.current(), name)
+
+    def _start(self):
+        request.environ['instrumentation'] = {'started': time.perf_counter(), 'queries': 0, 'db': 0.0, 'serialize': 0.0,
+                                              'size': 0, 'slow': [], 'slow_query_ms': self.slow_query_ms}
+
+    def _finish_headers(self, response):
+        record = self.current()
+        if record is None or request.endpoint == 'metrics': return response
+        elapsed = time.perf_counter() - record['started']
+        response.headers['Server-Timing'] = (
+            f'db;dur={record["db"] * 1000:.1f};desc="{record["queries"]} queries", '
+            f'serialize;dur={record["serialize"] * 1000:.1f}, app;dur={elapsed * 1000:.1f}')
+        labels = (('endpoint', request.endpoint or 'none'), ('method', request.method))
+        if response.is_streamed:
+            response.response = self._counted(response.response, record)
+        else:
+            record['size'] = response.calculate_content_length() or 0
+        response.call_on_close(lambda: self._record(record, labels))
+        return response
+
+    @staticmethod
+    def _counted(body, record):
+        try:
+            for chunk in body:
+                record['size'] += len(chunk)
+                yield chunk
+        finally:
+            if hasattr(body, 'close'): body.close() # ends the streaming context of stream_with_context
+
+    def _record(self, record, labels):
+        values = {'duration': time.perf_counter() - record['started'], 'db': record['db'], 'queries': record['queries'],
+                  'serialize': record['serialize'], 'size': record['size']}
+        with self._lock:
+            for name, value in values.items(): self.histograms[name].observe(labels, value)
+        for engine, statement, params, ms in record['slow']:
+            self._log_slow(labels[0][1], engine, statement, params, ms)
+
+    def _log_slow(self, endpoint, engine, statement, params, ms):
+        try:
+            with engine.connect() as connection:
+                plan = '\n'.join(f'  {line}' for line in explain(connection, statement, params))
+        except Exception as e: # the plan is a diagnostic, never fail the request over it
+            plan = f'  (EXPLAIN failed: {e})'
+        self.logger.warning('Slow query (%.1f ms) in %s:\n%s\nParameters: %r\nPlan:\n%s', ms, endpoint, statement, params, plan)
+
+    def metrics(self):
+        with self._lock:
+            lines = [line for histogram in self.histograms.values() for line in histogram.render()]
+        return '\n'.join(lines) + '\n', 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+
+class _Span:
+    def __init__(self, record, name):
+        self.record, self.name = record, name
+
+    def __enter__(self):
+        if self.record is not None: self.started, self.db = time.perf_counter(), self.record['db']
+
+    def __exit__(self, *exc):
+        if self.record is not None:
+            self.record[self.name] += time.perf_counter() - self.started - (self.record['db'] - self.db)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    record = Instrumentation.current()
+    if record is None: return
+    record['queries'] += 1
+    record['db'] += elapsed
+    if elapsed * 1000 >= record['slow_query_ms'] and not executemany and statement.lstrip().upper().startswith(EXPLAINED):
+        record['slow'].append((conn.engine, statement, parameters, elapsed * 1000))
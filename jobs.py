@@ -0,0 +1,135 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# --- WRITE-BEHIND JOB QUEUE ---
+# Side effects of a write that readers can see a moment late (search
+# documents, in-memory indexes, cache fan-out) run on background threads after
+# the endpoint has committed and answered. A job is a handler name plus the ids
+# of the entities it touches; enqueuing an id that is already waiting is a
+# no-op, and a worker hands every waiting id of a handler to one call, so a
+# burst of writes to the same students costs one refresh.
+#
+# Handlers run in an app context, must be idempotent and are retried up to
+# max_attempts times. With an outbox path, waiting ids are also kept in a
+# SQLite table and picked up again after a restart; ids are only lost if the
+# process dies between the endpoint's commit and the outbox insert.
+# workers=0 runs handlers inline on enqueue (scripts, benchmarks).
+
+log = logging.getLogger(__name__)
+
+
+class JobQueue:
+    def __init__(self, workers=2, outbox=None, batch_delay=0.05, max_batch=500, max_attempts=3):
+        self.workers = workers
+        self.outbox = outbox
+        self.batch_delay = batch_delay # seconds to wait for more ids before running a handler
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        self.app = None
+        self.handlers = {}
+        self._pid = None
+
+    def init_app(self, app):
+        # Takes JOB_WORKERS/_OUTBOX/_BATCH_DELAY from the app's config
+        self.app = app
+        self.workers = app.config['JOB_WORKERS']
+        self.outbox = app.config['JOB_OUTBOX'] or None
+        self.batch_delay = app.config['JOB_BATCH_DELAY']
+
+    def handler(self, name):
+        # Decorator registering fn(ids) as the handler of job `name`
+        def register(fn):
+            self.handlers[name] = fn
+            return fn
+        return register
+
+    def start(self):
+        # Threads, lock and outbox connection are created per process, on the first
+        # enqueue or here, so that each pre-forked server worker gets its own (the
+        # master's don't survive the fork). Starting picks up ids left in the outbox.
+        with _start_lock:
+            if self._pid != os.getpid(): self._start()
+
+    def _start(self):
+        self._lock = threading.Condition()
+        self._pending = {} # name -> {id: attempts}
+        self._running = {} # name -> ids a worker is processing
+        self._db = None
+        if self.outbox:
+            self._db = sqlite3.connect(self.outbox, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS job_outbox (name TEXT NOT NULL, entity_id INTEGER NOT NULL, PRIMARY KEY (name, entity_id))')
+            for name, entity_id in self._db.execute('SELECT name, entity_id FROM job_outbox'):
+                self._pending.setdefault(name, {})[entity_id] = 0
+        self._pid = os.getpid()
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f'jobs-{i}', daemon=True).start()
+
+    def enqueue(self, name, ids):
+        ids = list(dict.fromkeys(ids))
+        if not ids: return
+        if not self.workers: return self._call(name, ids)
+        if self._pid != os.getpid(): self.start()
+        with self._lock:
+            if self._db: self._db.executemany('INSERT OR IGNORE INTO job_outbox VALUES (?, ?)', [(name, i) for i in ids])
+            pending = self._pending.setdefault(name, {})
+            for entity_id in ids: pending.setdefault(entity_id, 0)
+            self._lock.notify()
+
+    def flush(self, timeout=10):
+        # Waits until nothing is waiting or running; True when it got there in time
+        if self._pid != os.getpid(): return True
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while any(self._pending.values()) or any(self._running.values()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0: return False
+                self._lock.wait(remaining)
+        return True
+
+    def _call(self, name, ids):
+        with self.app.app_context():
+            self.handlers[name](ids)
+
+    def _take(self):
+        # (name, {id: attempts}) of the handler with the most waiting ids not already running
+        ready = [(len(ids.keys() - self._running.get(name, ())), name) for name, ids in self._pending.items()]
+        count, name = max(ready, default=(0, None))
+        if not count: return None, None
+        pending, running = self._pending[name], self._running.setdefault(name, set())
+        batch = {}
+        for entity_id in list(pending):
+            if entity_id in running: continue
+            batch[entity_id] = pending.pop(entity_id)
+            if len(batch) == self.max_batch: break
+        running.update(batch)
+        return name, batch
+
+    def _work(self):
+        while True:
+            with self._lock:
+                while not any(ids.keys() - self._running.get(name, ()) for name, ids in self._pending.items()):
+                    self._lock.wait()
+            time.sleep(self.batch_delay) # let a burst of writes coalesce
+            with self._lock:
+                name, batch = self._take()
+            if not batch: continue
+            try:
+                self._call(name, list(batch))
+                failed = {}
+            except Exception:
+                log.exception('Job %s failed for %d ids', name, len(batch))
+                failed = {i: attempts + 1 for i, attempts in batch.items() if attempts + 1 < self.max_attempts}
+            with self._lock:
+                self._running[name].difference_update(batch)
+                pending = self._pending.setdefault(name, {})
+                for entity_id, attempts in failed.items(): pending.setdefault(entity_id, attempts)
+                done = [(name, i) for i in batch if i not in pending]
+                if self._db and done: self._db.executemany('DELETE FROM job_outbox WHERE name = ? AND entity_id = ?', done)
+                self._lock.notify_all()
+
+
+_start_lock = threading.Lock()
@@ -0,0 +1,35 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError: # optional: falls back to the standard library encoder
+    orjson = None
+
+# --- JSON ENCODING ---
+# Flask JSON provider backed by orjson when it's installed. jsonify() and
+# app.json.dumps() go through it, and dumps_bytes() skips the str round trip
+# for bodies that are written straight to the response (cache, streaming).
+# Keys keep the order the serializers build them in.
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+
+    def dumps_bytes(self, obj):
+        if orjson is None: return self.dumps(obj, separators=(',', ':')).encode()
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+
+    def dumps(self, obj, **kwargs):
+        # Formatting options (indent, custom separators) need the standard encoder
+        if orjson is None or set(kwargs) - {'separators'}: return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs: return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None or (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
@@ -0,0 +1,104 @@
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, inspect, select
+
+# --- SCHEMA MIGRATIONS ---
+# Versioned, forward-only schema changes. Each pending migration runs once, in
+# version order, inside its own transaction, and is recorded in
+# schema_migrations. They are written to be safe on databases that were
+# created by the old bare db.create_all() as well as on empty ones.
+
+MIGRATIONS = []
+
+schema_migrations = Table(
+    'schema_migrations', MetaData(),
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('name', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+def migration(version, name):
+    def register(fn):
+        MIGRATIONS.append((version, name, fn))
+        return fn
+    return register
+
+
+def upgrade(engine, metadata):
+    # Applies every pending migration and returns the (version, name) pairs it ran
+    with engine.begin() as connection:
+        schema_migrations.create(connection, checkfirst=True)
+        applied = set(connection.execute(select(schema_migrations.c.version)).scalars())
+    ran = []
+    for version, name, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version in applied: continue
+        with engine.begin() as connection:
+            fn(connection, metadata)
+            connection.execute(schema_migrations.insert().values(version=version, name=name, applied_at=datetime.utcnow()))
+        ran.append((version, name))
+    return ran
+
+
+# --- HELPERS ---
+def create_missing_indexes(connection, metadata, names):
+    # Creates the named model indexes the database doesn't have yet. Named rather
+    # than every index in metadata: the models describe the newest schema, and an
+    # index on a column a later migration adds can't be built before it runs.
+    inspector = inspect(connection)
+    indexes = {index.name: index for table in metadata.sorted_tables for index in table.indexes}
+    for name in names:
+        index = indexes[name]
+        if name not in {existing['name'] for existing in inspector.get_indexes(index.table.name)}:
+            index.create(connection)
+
+
+def add_missing_column(connection, metadata, tablename, name, default):
+    # ALTER TABLE ADD COLUMN for a model column the table doesn't have yet, filling existing rows with default
+    if name in {column['name'] for column in inspect(connection).get_columns(tablename)}: return
+    column, quote = metadata.tables[tablename].c[name], connection.dialect.identifier_preparer.quote
+    column_type = column.type.compile(dialect=connection.dialect)
+    connection.exec_driver_sql(f'ALTER TABLE {quote(tablename)} ADD COLUMN {quote(name)} {column_type} NOT NULL DEFAULT {default}')
+
+
+def delete_duplicates(connection, tablename, columns):
+    # Keeps the oldest row of each duplicate group so a unique index can be added
+    quote = connection.dialect.identifier_preparer.quote
+    table, cols = quote(tablename), ', '.join(quote(c) for c in columns)
+    # The derived table lets MySQL delete from a table it also reads from
+    connection.exec_driver_sql(
+        f'DELETE FROM {table} WHERE id NOT IN '
+        f'(SELECT id FROM (SELECT MIN(id) AS id FROM {table} GROUP BY {cols}) AS keep)')
+
+
+# --- MIGRATIONS ---
+@migration(1, 'baseline tables')
+def create_tables(connection, metadata):
+    metadata.create_all(connection, checkfirst=True)
+
+
+@migration(2, 'association uniqueness and query indexes')
+def add_query_indexes(connection, metadata):
+    delete_duplicates(connection, 'user_skill', ('user_id', 'skill_id'))
+    delete_duplicates(connection, 'project_member', ('user_id', 'project_id'))
+    delete_duplicates(connection, 'project_tool', ('project_id', 'tool_id'))
+    create_missing_indexes(connection, metadata, (
+        'ux_user_skill_user_skill', 'ix_user_skill_skill_rating_user',
+        'ux_project_member_user_project', 'ix_project_member_project_user',
+        'ux_project_tool_project_tool', 'ix_project_tool_tool_project',
+        'ix_user_year', 'ix_user_branch', 'ix_user_institute_id',
+        'ix_project_start_date_id', 'ix_project_name',
+    ))
+
+
+@migration(3, 'student search documents')
+def add_student_search_doc(connection, metadata):
+    # The documents themselves are built by the app on start (ensure_search_docs)
+    metadata.create_all(connection, checkfirst=True)
+
+
+@migration(4, 'row versions')
+def add_row_versions(connection, metadata):
+    # Rows from before versioning share version 0; every later write moves theirs past it
+    for tablename in ('user', 'project', 'student_search_doc'):
+        add_missing_column(connection, metadata, tablename, 'version', 0)
+    create_missing_indexes(connection, metadata, ('ix_user_version', 'ix_project_version', 'ix_student_search_doc_version'))
@@ -1,5 +0,0 @@
-from flask import Blueprint
-
-auth_bp = Blueprint('auth', __name__)
-
-from . import routes
\ No newline at end of file
@@ -1 +0,0 @@
-// This file is intentionally left blank.
\ No newline at end of file
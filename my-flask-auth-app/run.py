@@ -1,6 +0,0 @@
-from app import create_app
-
-app = create_app()
-
-if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,105 @@
+import os
+import threading
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# --- PASSWORD HASHING POOL ---
+# PBKDF2 is deliberately slow CPU work. Running it on the request thread lets a
+# burst of logins starve every other request on the worker, so hashes are
+# computed in a small process pool instead. At most max_pending hashes may be
+# queued or running; past that the caller gets HasherBusy (served as a 429)
+# rather than an ever-growing queue.
+
+
+class HasherBusy(Exception):
+    pass
+
+
+def parse_method(method):
+    # "pbkdf2:sha256:1000000" -> (('pbkdf2', 'sha256'), (1000000,)), "scrypt:32768:8:1" -> (('scrypt',), (32768, 8, 1))
+    parts = method.split(':')
+    cost = tuple(int(part) for part in parts if part.isdigit())
+    return tuple(part for part in parts if not part.isdigit()), cost
+
+
+class PasswordHasher:
+    def __init__(self, method='pbkdf2:sha256', workers=2, max_pending=32, timeout=10):
+        # workers=0 hashes inline on the calling thread (scripts, single-user dev)
+        self.method = method
+        self._target = None
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._bulk_executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        # Takes PASSWORD_HASH_METHOD/_WORKERS/_MAX_PENDING from the app's config
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self._slots = threading.BoundedSemaphore(app.config['PASSWORD_HASH_MAX_PENDING'])
+        self._target = None
+        self.target() # once here, so pre-forked workers inherit it instead of paying on a login
+
+    def _pool(self):
+        # Created lazily so each pre-forked server worker gets its own pool
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers: return fn(*args)
+        slots = self._slots
+        if not slots.acquire(blocking=False): raise HasherBusy()
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HasherBusy() from None
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def hash_many(self, passwords, method=None, workers=None):
+        # Hashes for batch jobs (bulk import) on a pool of their own, one process per
+        # CPU by default and without the max_pending limit; not for request threads
+        passwords, workers = list(passwords), workers or os.cpu_count()
+        if self._bulk_executor is None: self._bulk_executor = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(self._bulk_executor.map(generate_password_hash, passwords, repeat(method or self.method), chunksize=chunksize))
+
+    def verify(self, stored_hash, password):
+        return self._run(check_password_hash, stored_hash, password)
+
+    def target(self):
+        # The configured method as werkzeug stores it: short names like "pbkdf2:sha256" or
+        # "scrypt" are written with werkzeug's current parameters filled in, so the
+        # stored form comes from hashing a dummy value once
+        if self._target is None:
+            self._target = parse_method(generate_password_hash('', self.method).split('$', 1)[0])
+        return self._target
+
+    def needs_rehash(self, stored_hash):
+        # Stored hashes look like "<method>$<salt>$<hash>". Outdated: another algorithm, or
+        # any cost parameter below the configured one; stronger hashes are kept as they are
+        algorithm, cost = parse_method(stored_hash.split('$', 1)[0])
+        target_algorithm, target_cost = self.target()
+        if algorithm != target_algorithm or len(cost) != len(target_cost): return True
+        return any(have < want for have, want in zip(cost, target_cost))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._bulk_executor is not None:
+            self._bulk_executor.shutdown(wait=False, cancel_futures=True)
+            self._bulk_executor = None
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+
+# --- RESPONSE CACHE ---
+# Pre-serialized JSON bodies for detail endpoints, keyed by entity kind, id and
+# a per-entity version. Invalidating an entity bumps its version instead of
+# deleting the body, so a response built concurrently with a write is stored
+# under the old version and never served afterwards.
+#
+# Backends: MemoryBackend (per worker, LRU + TTL) or RedisBackend, which works
+# with any client speaking get/set/incr (redis-py or a local stand-in) and
+# shares bodies and invalidations across workers.
+
+
+class MemoryBackend:
+    def __init__(self, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict() # key -> (expires_at, body), least recently used first
+        self._versions = {} # never evicted: losing a version could resurrect a stale body
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, body):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def version(self, key):
+        return self._versions.get(key, 0)
+
+    def bump(self, key):
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+
+class RedisBackend:
+    def __init__(self, client, ttl=300, prefix='skilllink:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, ttl=300):
+        import redis # optional dependency, only needed for this backend
+        return cls(redis.Redis.from_url(url), ttl)
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, body):
+        self.client.set(self.prefix + key, body, ex=self.ttl)
+
+    def version(self, key):
+        return int(self.client.get(f'{self.prefix}{key}:version') or 0)
+
+    def bump(self, key):
+        self.client.incr(f'{self.prefix}{key}:version')
+
+
+class ResponseCache:
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    def init_app(self, app):
+        # RESPONSE_CACHE_URL picks Redis; otherwise bodies are kept in this process
+        url, ttl = app.config['RESPONSE_CACHE_URL'], app.config['RESPONSE_CACHE_TTL']
+        self.backend = RedisBackend.from_url(url, ttl) if url else MemoryBackend(app.config['RESPONSE_CACHE_MAX_ENTRIES'], ttl)
+
+    def fetch(self, kind, entity_id, build, variant=''):
+        # Cached body for the entity, or build() -> bytes stored under the version
+        # read *before* building. build() may return None (e.g. not found), which isn't cached.
+        entity = f'{kind}:{entity_id}'
+        key = f'{entity}:v{self.backend.version(entity)}:{variant}'
+        body = self.backend.get(key)
+        if body is None:
+            body = build()
+            if body is not None: self.backend.set(key, body)
+        return body
+
+    def invalidate(self, kind, *entity_ids):
+        for entity_id in entity_ids:
+            self.backend.bump(f'{kind}:{entity_id}')
@@ -83,7 +83,7 @@ async function fetchAndRenderData(endpoint) {
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
-        const studentsData = await response.json();
+        const studentsData = (await response.json()).results;
 
         // Render the data
         if (studentsData && studentsData.length > 0) {
@@ -115,6 +115,13 @@ document.addEventListener('DOMContentLoaded', () => {
         }
         if (!logoSpan) return; // Exit if the logo element isn't found
 
+        // The login token's details carry the institute, no request needed
+        const storedUser = JSON.parse(localStorage.getItem('skillLinkUser') || 'null');
+        if (storedUser) {
+            logoSpan.textContent = storedUser.institute || "SkillLink";
+            return;
+        }
+
         try {
             // Use the same API endpoint as the profile page
             const response = await fetch(`/api/profile/${loggedInUserId}`);
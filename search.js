@@ -37,6 +37,7 @@ document.addEventListener('DOMContentLoaded', () => {
     let mainSearchTerm = '';
     let searchTimeout;
     let skillToRate = null; // {name: string}
+    let facetCounts = null; // { institute: [{value, count}], branch: [...], year: [...], skill: [...] }
     let selectedModalRating = 0;
     const ratingMessages = { 0: '', 1: 'Beginner', 2: 'Have experience', 3: 'Intermediate', 4: 'Well experienced', 5: 'Expert' };
     const loggedInUserId = localStorage.getItem('skillLinkUserID'); // Get logged-in user ID
@@ -45,6 +46,9 @@ document.addEventListener('DOMContentLoaded', () => {
     // --- API Helper ---
     async function apiFetch(url, options = {}) {
         try {
+            // The token tells the server who is searching (they're left out of the results)
+            const token = localStorage.getItem('skillLinkToken');
+            if (token) options.headers = { ...options.headers, 'Authorization': `Bearer ${token}` };
             const response = await fetch(url, options);
             if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
             return await response.json();
@@ -94,6 +98,35 @@ document.addEventListener('DOMContentLoaded', () => {
             container.appendChild(label);
         });
         addCheckboxListeners(container, filterName);
+        renderFacetCounts();
+    }
+
+    // --- Facet Counts ---
+    // Number of matching students next to each institute/branch/year option,
+    // for the current search (one ?facets=1 request per search)
+    async function loadFacetCounts(params) {
+        params.set('facets', '1');
+        const page = await apiFetch(`/api/students/search?${params.toString()}`);
+        if (!page) return;
+        facetCounts = page.facets;
+        renderFacetCounts();
+    }
+
+    function renderFacetCounts() {
+        if (!facetCounts) return;
+        [['institute', instituteFilterOptions], ['branch', branchFilterOptions], ['year', yearFilterOptions]].forEach(([facet, container]) => {
+            const counts = new Map(facetCounts[facet].map(item => [String(item.value), item.count]));
+            container.querySelectorAll(`input[name="${facet}"]`).forEach(input => {
+                if (input.value === 'all') return;
+                let badge = input.parentElement.querySelector('.facet-count');
+                if (!badge) {
+                    badge = document.createElement('span');
+                    badge.className = 'facet-count';
+                    input.parentElement.appendChild(badge);
+                }
+                badge.textContent = counts.get(input.value) || 0;
+            });
+        });
     }
 
     // --- Filter Input Handling ---
@@ -241,11 +274,13 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     // --- Perform Search Function ---
-    async function performSearch() {
-        resultsArea.innerHTML = '<p class="empty-state">Searching...</p>';
+    // Results arrive one page at a time; passing the previous page's cursor appends the next page.
+    async function performSearch(cursor = null) {
+        if (!cursor) resultsArea.innerHTML = '<p class="empty-state">Searching...</p>';
         const params = new URLSearchParams();
         params.set('q', mainSearchTerm);
-        if(loggedInUserId) params.set('exclude_id', loggedInUserId);
+        if (cursor) params.set('cursor', cursor);
+        if (loggedInUserId && !localStorage.getItem('skillLinkToken')) params.set('exclude_id', loggedInUserId); // logged in before tokens
 
         if (currentFilters.institute[0] !== 'all') currentFilters.institute.forEach(val => params.append('institute', val));
         if (currentFilters.branch[0] !== 'all') currentFilters.branch.forEach(val => params.append('branch', val));
@@ -254,16 +289,20 @@ document.addEventListener('DOMContentLoaded', () => {
         const skillFilterParts = Object.entries(currentFilters.skills).map(([name, level]) => `${name}:${level}`);
         if (skillFilterParts.length > 0) params.set('skills', skillFilterParts.join(','));
 
+        if (!cursor) loadFacetCounts(new URLSearchParams(params));
         const endpoint = `/api/students/search?${params.toString()}`;
         console.log("Fetching:", endpoint); // Debug log for fetch URL
-        const users = await apiFetch(endpoint);
-        renderResults(users);
+        const page = await apiFetch(endpoint);
+        if (!page) return;
+        renderResults(page.results, page.next_cursor, Boolean(cursor));
     }
 
     // --- Render Results ---
-    function renderResults(users) {
-        resultsArea.innerHTML = '';
-        if (!users || users.length === 0) {
+    function renderResults(users, nextCursor, append = false) {
+        const loadMoreBtn = document.getElementById('load-more-btn');
+        if (loadMoreBtn) loadMoreBtn.remove();
+        if (!append) resultsArea.innerHTML = '';
+        if (!append && (!users || users.length === 0)) {
             resultsArea.innerHTML = '<p class="empty-state">No users found matching your criteria.</p>';
             return;
         }
@@ -279,6 +318,14 @@ document.addEventListener('DOMContentLoaded', () => {
             if (cardElement) cardElement.style.cursor = 'pointer';
             resultsArea.appendChild(link);
         });
+        if (nextCursor) {
+            const button = document.createElement('button');
+            button.id = 'load-more-btn';
+            button.className = 'btn btn-secondary';
+            button.textContent = 'Load more';
+            button.addEventListener('click', () => performSearch(nextCursor));
+            resultsArea.appendChild(button);
+        }
     }
 
     // --- Card Generation & Star Rating (Corrected) ---
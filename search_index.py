@@ -0,0 +1,116 @@
+import re
+from sqlalchemy import select, table, column, literal_column, func, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import DBAPIError
+
+# --- FULL-TEXT SEARCH BACKENDS ---
+# A backend owns the full-text indexes for a set of "documents" (table name ->
+# searchable columns) and turns a user's search box text into a subquery of
+# matching (id, score) rows, higher score = better match. matches() returns None
+# when the table has no usable index, and callers fall back to ILIKE.
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class LikeSearch:
+    name = 'like'
+    min_token_size = 1
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.indexed = set()
+
+    def install(self, connection):
+        pass
+
+    def tokens(self, term):
+        return [t for t in TOKEN_RE.findall(term.lower()) if len(t) >= self.min_token_size]
+
+    def matches(self, tablename, term):
+        return None
+
+
+class SQLiteFTS5Search(LikeSearch):
+    # External-content FTS5 tables kept in sync with the base table by triggers
+    name = 'fts5'
+
+    def install(self, connection):
+        for tablename, columns in self.documents.items():
+            fts = f'{tablename}_fts'
+            exists = connection.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': fts}).first()
+            if not exists:
+                try:
+                    self._create(connection, tablename, fts, columns)
+                except DBAPIError:
+                    continue # SQLite built without FTS5: leave this table on ILIKE
+            self.indexed.add(tablename)
+
+    def _create(self, connection, tablename, fts, columns):
+        cols = ', '.join(columns)
+        new = ', '.join(f'new.{c}' for c in columns)
+        old = ', '.join(f'old.{c}' for c in columns)
+        delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});"
+        insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});"
+        connection.exec_driver_sql(f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{tablename}', content_rowid='id')")
+        connection.exec_driver_sql(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON "{tablename}" BEGIN {insert_new} END')
+        connection.exec_driver_sql(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON "{tablename}" BEGIN {delete_old} END')
+        connection.exec_driver_sql(f'CREATE TRIGGER {fts}_au AFTER UPDATE ON "{tablename}" BEGIN {delete_old} {insert_new} END')
+        connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def matches(self, tablename, term):
+        tokens = self.tokens(term)
+        if tablename not in self.indexed or not tokens: return None
+        fts = f'{tablename}_fts'
+        # Every word must match, each as a prefix: "lak pri" finds "Lakshmi Priya"
+        expression = ' '.join(f'"{t}"*' for t in tokens)
+        return (select(literal_column('rowid').label('id'), (-func.bm25(literal_column(fts))).label('score'))
+                .select_from(table(fts))
+                .where(literal_column(fts).op('MATCH')(expression))
+                .subquery())
+
+
+class MySQLFulltextSearch(LikeSearch):
+    # InnoDB FULLTEXT indexes are maintained by MySQL itself on insert/update
+    name = 'fulltext'
+    min_token_size = 3 # innodb_ft_min_token_size default, refreshed on install
+
+    def install(self, connection):
+        self.min_token_size = connection.execute(text('SELECT @@innodb_ft_min_token_size')).scalar() or self.min_token_size
+        for tablename, columns in self.documents.items():
+            index = f'ft_{tablename}_search'
+            exists = connection.execute(text(
+                "SELECT 1 FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :index"),
+                {'table': tablename, 'index': index}).first()
+            if not exists:
+                connection.exec_driver_sql(f"ALTER TABLE `{tablename}` ADD FULLTEXT INDEX {index} ({', '.join(columns)})")
+            self.indexed.add(tablename)
+
+    def matches(self, tablename, term):
+        tokens = self.tokens(term)
+        if tablename not in self.indexed or not tokens: return None
+        columns = self.documents[tablename]
+        t = table(tablename, column('id'), *(column(c) for c in columns))
+        score = mysql.match(*(t.c[c] for c in columns), against=' '.join(f'+{tok}*' for tok in tokens)).in_boolean_mode()
+        return select(t.c.id.label('id'), score.label('score')).where(score).subquery()
+
+
+BACKENDS = {'sqlite': SQLiteFTS5Search, 'mysql': MySQLFulltextSearch}
+
+
+class SearchIndex:
+    # Holds whichever backend install() picked, so routes can use it before setup runs
+    def __init__(self, documents):
+        self.documents = documents
+        self.backend = LikeSearch(documents)
+
+    def install(self, engine, mode='auto'):
+        backend_cls = LikeSearch if mode == 'like' else BACKENDS.get(engine.dialect.name, LikeSearch)
+        backend = backend_cls(self.documents)
+        with engine.begin() as connection:
+            backend.install(connection)
+        self.backend = backend
+        return backend
+
+    def matches(self, tablename, term):
+        return self.backend.matches(tablename, term)
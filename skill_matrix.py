@@ -0,0 +1,104 @@
+import threading
+import time
+import numpy as np
+
+# --- SKILL MATRIX ---
+# Every user's skill ratings as one dense users x skills float32 matrix, held
+# per worker (100k users x 50 skills is ~20 MB). Ranking users against a
+# target profile only reads the target's columns, so a query is a handful of
+# vectorized passes over n x k values plus an argpartition for the top k.
+#
+# The loader yields (user_id, [(skill_id, rating), ...]); called with a list of
+# ids it yields just those users. Writes in this worker call update() for the
+# users they changed; the TTL bounds how stale another worker's copy can get.
+
+
+class _State:
+    def __init__(self, rows, ttl):
+        skill_ids = sorted({skill_id for _, pairs in rows for skill_id, _ in pairs})
+        self.columns = {skill_id: j for j, skill_id in enumerate(skill_ids)}
+        self.rows = {user_id: i for i, (user_id, _) in enumerate(rows)}
+        self.size = len(rows)
+        capacity = self.size + max(64, self.size // 8) # room for registrations before reallocating
+        self.user_ids = np.zeros(capacity, dtype=np.int64)
+        self.user_ids[:self.size] = [user_id for user_id, _ in rows]
+        self.ratings = np.zeros((capacity, len(skill_ids)), dtype=np.float32)
+        coords = [(i, self.columns[skill_id], rating) for i, (_, pairs) in enumerate(rows) for skill_id, rating in pairs]
+        if coords:
+            i, j, rating = zip(*coords)
+            self.ratings[list(i), list(j)] = rating
+        self.norms = np.linalg.norm(self.ratings, axis=1)
+        self.expires_at = time.monotonic() + ttl
+
+    def set_row(self, user_id, pairs):
+        i = self.rows.get(user_id)
+        if i is None:
+            if self.size == len(self.user_ids): return False
+            i = self.rows[user_id] = self.size
+            self.user_ids[i] = user_id
+            self.size += 1
+        self.ratings[i] = 0
+        for skill_id, rating in pairs: self.ratings[i, self.columns[skill_id]] = rating
+        self.norms[i] = np.linalg.norm(self.ratings[i])
+        return True
+
+
+class SkillMatrix:
+    def __init__(self, loader, ttl=600):
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state = None
+
+    def invalidate(self):
+        self._state = None
+
+    def load(self):
+        state = _State(list(self.loader()), self.ttl)
+        self._state = state
+        return state
+
+    def _current(self):
+        state = self._state
+        if state is None or state.expires_at < time.monotonic():
+            with self._lock:
+                state = self._state
+                if state is None or state.expires_at < time.monotonic():
+                    state = self.load()
+        return state
+
+    def update(self, user_ids):
+        # Re-reads the rows of user_ids; a skill the matrix has no column for (or
+        # a full matrix) drops it, and the next query rebuilds it from scratch
+        state = self._state
+        if state is None: return
+        rows = list(self.loader(list(user_ids)))
+        with self._lock:
+            if self._state is not state: return
+            for user_id, pairs in rows:
+                if any(skill_id not in state.columns for skill_id, _ in pairs) or not state.set_row(user_id, pairs):
+                    self._state = None
+                    return
+
+    def rank(self, target, limit=10, mode='cosine', exclude=()):
+        # [(user_id, score)] best first, for target {skill_id: wanted rating}. Scores are in [0, 1]:
+        #   cosine:   angle between the user's whole rating vector and the target
+        #   coverage: share of the wanted ratings the user meets, min(rating, wanted) / wanted summed
+        state = self._current()
+        n = state.size
+        known = [(state.columns[skill_id], wanted) for skill_id, wanted in target.items() if skill_id in state.columns]
+        if not n or not known: return []
+        columns, wanted = [j for j, _ in known], np.array([w for _, w in known], dtype=np.float32)
+        ratings = state.ratings[:n, columns]
+        if mode == 'coverage':
+            scores = np.minimum(ratings, wanted).sum(axis=1) / sum(target.values())
+        else:
+            target_norm = np.linalg.norm(list(target.values()))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = np.nan_to_num(ratings @ wanted / (state.norms[:n] * target_norm))
+        excluded = [state.rows[user_id] for user_id in exclude if user_id in state.rows]
+        if excluded: scores[excluded] = 0
+        limit = min(limit, n)
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(state.user_ids[i]), float(scores[i])) for i in top if scores[i] > 0]
@@ -0,0 +1,110 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from flask import abort, current_app, request
+
+try:
+    import brotli
+except ImportError: # optional: only gzip variants are built without it
+    brotli = None
+
+# --- STATIC ASSETS ---
+# The frontend is read once at startup and served from memory. Stylesheets,
+# scripts and images get a content hash in their name (style.css ->
+# style.1a2b3c4d5e6f.css) and are cached by browsers for a year as immutable.
+# The HTML and CSS that reference them are rewritten to use the hashed names.
+# Pages keep their plain names and are revalidated with their ETag, so a
+# deploy shows up on the next page view and unchanged pages get a 304.
+# Compressible files also keep gzip (and brotli, when installed) variants.
+#
+# Only files with an extension listed in ASSET_TYPES are served, so the Python
+# sources and config next to the frontend are never exposed.
+
+ASSET_TYPES = ('.html', '.css', '.js', '.jpeg', '.jpg', '.png', '.gif', '.svg', '.ico', '.woff2')
+FINGERPRINTED = ('.css', '.js', '.jpeg', '.jpg', '.png', '.gif', '.svg', '.ico', '.woff2')
+COMPRESSED = ('.html', '.css', '.js', '.svg')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+# href="...", src="..." and url(...) values that are plain relative file names
+REFERENCE = re.compile(r'''(?P<before>(?:href|src)\s*=\s*["']|url\(\s*["']?)(?P<name>[\w.-]+)(?=["')?#])''')
+
+
+class Asset:
+    def __init__(self, body, mimetype, compress):
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.variants = {'identity': body} # content-coding -> bytes, only kept when smaller
+        if compress:
+            if brotli is not None: self._add('br', brotli.compress(body, quality=11))
+            self._add('gzip', gzip.compress(body, 9, mtime=0))
+
+    def _add(self, coding, body):
+        if len(body) < len(self.variants['identity']): self.variants[coding] = body
+
+
+class StaticAssets:
+    def __init__(self, root=None):
+        self.root = root
+        self.assets = {} # URL path -> (Asset, Cache-Control), under both plain and hashed names
+        self.urls = {} # file name -> hashed URL path
+        self._mtimes = None
+        self.auto_reload = False
+
+    def init_app(self, app):
+        self.root = app.config['STATIC_ROOT']
+        self.auto_reload = app.debug # pick up edits without restarting the dev server
+        self.build()
+
+    def _files(self):
+        names = sorted(n for n in os.listdir(self.root)
+                       if n.endswith(ASSET_TYPES) and os.path.isfile(os.path.join(self.root, n)))
+        return {name: os.path.getmtime(os.path.join(self.root, name)) for name in names}
+
+    def _rewrite(self, body, urls):
+        def replace(match):
+            url = urls.get(match.group('name'))
+            return match.group('before') + url if url else match.group(0)
+        return REFERENCE.sub(replace, body.decode()).encode()
+
+    def build(self):
+        files = self._files()
+        # Files that reference others last, so their hashes cover the rewritten references
+        ordered = sorted(files, key=lambda name: (name.endswith('.html'), name.endswith(('.css', '.js'))))
+        assets, urls = {}, {}
+        for name in ordered:
+            with open(os.path.join(self.root, name), 'rb') as f: body = f.read()
+            if name.endswith(('.html', '.css')): body = self._rewrite(body, urls)
+            asset = Asset(body, mimetypes.guess_type(name)[0] or 'application/octet-stream', name.endswith(COMPRESSED))
+            # The plain name stays available for anything not rewritten, but must revalidate
+            assets[name] = (asset, REVALIDATE)
+            if name.endswith(FINGERPRINTED):
+                stem, ext = os.path.splitext(name)
+                urls[name] = f'{stem}.{asset.etag[:12]}{ext}'
+                assets[urls[name]] = (asset, IMMUTABLE)
+        self.assets, self.urls, self._mtimes = assets, urls, files
+        return assets
+
+    def _coding(self, asset):
+        # Best variant the client accepts; werkzeug parses q-values (q=0 means refused)
+        accepted = request.accept_encodings
+        for coding in ('br', 'gzip'):
+            if coding in asset.variants and accepted[coding] > 0: return coding
+        return 'identity'
+
+    def serve(self, path):
+        if self.auto_reload and self._files() != self._mtimes: self.build()
+        if path not in self.assets: abort(404)
+        asset, cache_control = self.assets[path]
+        coding = self._coding(asset)
+        etag = asset.etag if coding == 'identity' else f'{asset.etag}-{coding}'
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(asset.variants[coding], mimetype=asset.mimetype)
+            if coding != 'identity': response.headers['Content-Encoding'] = coding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        response.vary.add('Accept-Encoding')
+        return response
@@ -0,0 +1,7 @@
+# Production entry point:  gunicorn -c gunicorn.conf.py wsgi:app
+# The module is imported once in the gunicorn master (preload_app), so the
+# imports, the app and the pending migrations are done before workers fork.
+from app import create_app, upgrade_database
+
+app = create_app()
+upgrade_database(app)